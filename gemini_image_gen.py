@@ -1,152 +1,669 @@
 import sys
 import os
+import argparse
 import json
-import base64
+import asyncio
+import functools
+import hashlib
+import itertools
+import mmap
+import threading
+import time
 import tempfile
 import shutil
 from io import BytesIO
 from pathlib import Path
+from types import MappingProxyType
 
-from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QPushButton, QLineEdit, QTextEdit, QLabel, 
-                             QFileDialog, QMessageBox, QStatusBar, QGroupBox, QFormLayout,
-                             QFrame, QSizePolicy, QSpacerItem, QScrollArea, QProgressBar,
-                             QComboBox, QSplitter, QInputDialog)
-from PySide6.QtCore import Qt, QThread, Signal, QTimer, QPropertyAnimation, QEasingCurve, QRect
-from PySide6.QtGui import QPixmap, QFont, QPalette, QColor, QIcon, QDragEnterEvent, QDropEvent
-import qtawesome as qta
+from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
+                             QWidget, QPushButton, QLineEdit, QTextEdit, QLabel,
+                             QFileDialog, QMessageBox, QStatusBar,
+                             QFrame, QProgressBar,
+                             QComboBox, QInputDialog, QCheckBox)
+from PySide6.QtCore import (Qt, QObject, QRunnable, QThreadPool, Signal, QTimer)
+from PySide6.QtGui import (QPixmap, QImage, QImageReader,
+                           QDragEnterEvent, QDropEvent, QTextCursor)
+import importlib.util
+
+def module_available(name):
+    """Check for a module without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# Availability is probed cheaply at startup; the heavy imports themselves are
+# deferred to first use so the window appears before the SDKs load.
+PIL_AVAILABLE = module_available('PIL')
+GEMINI_AVAILABLE = PIL_AVAILABLE and module_available('google.genai')
+KEYRING_AVAILABLE = module_available('keyring')
+
+KEYRING_SERVICE = 'gemini-image-gen'
+
+genai = None
+types = None
+Image = None
+ImageDraw = None
+ImageFont = None
+
+@functools.lru_cache(maxsize=None)
+def cached_icon(name, color=None):
+    """Memoized qtawesome icon lookup; each qta.icon call parses font data"""
+    import qtawesome as qta
+    if color:
+        return qta.icon(name, color=color)
+    return qta.icon(name)
+
+def load_heavy_imports():
+    """Import the Gemini SDK and PIL on first use"""
+    global genai, types, Image, ImageDraw, ImageFont
+    if Image is None and PIL_AVAILABLE:
+        from PIL import Image, ImageDraw, ImageFont
+    if genai is None and GEMINI_AVAILABLE:
+        from google import genai
+        from google.genai import types
+
+# Qt image format hints, keyed by extension, to skip decoder content sniffing
+QT_FORMATS = {
+    '.png': 'PNG',
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.bmp': 'BMP',
+    '.gif': 'GIF',
+}
+
+MIME_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.bmp': 'image/bmp',
+    '.gif': 'image/gif',
+}
+
+IMAGE_EXTENSIONS = frozenset(MIME_TYPES)
+
+# Available models, frozen and shared by all windows
+MODELS = MappingProxyType({
+    "Gemini 2.0 Flash": "gemini-2.0-flash",
+    "Gemini 2.0 Flash (Image Gen)": "gemini-2.0-flash-preview-image-generation",
+    "Gemini 2.0 Flash-Lite": "gemini-2.0-flash-lite",
+    "Gemini 1.5 Flash": "gemini-1.5-flash",
+    "Gemini 1.5 Flash-8B": "gemini-1.5-flash-8b",
+    "Gemini 1.5 Pro": "gemini-1.5-pro",
+    "Imagen 4": "imagen-4.0-generate-preview-06-06",
+    "Imagen 4 Ultra": "imagen-4.0-ultra-generate-preview-06-06",
+})
+
+RECOGNITION_MODEL = 'gemini-2.5-flash'
+RECOG_CACHE_DIR = Path.home() / '.cache' / 'gemini-image-gen' / 'recog'
 
 try:
-    from google import genai
-    from google.genai import types
-    from PIL import Image
-    GEMINI_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    GEMINI_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGRX, TJFLAG_FASTDCT, TJFLAG_FASTUPSAMPLE
+    _TJ = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError):
+    TURBOJPEG_AVAILABLE = False
+
+def read_config_file(path):
+    """Read and parse a config file in one binary read"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def jpeg_scaling_factor(jpeg_bytes, target_size):
+    """Pick the largest DCT-domain downscale that still covers target_size"""
+    width, height, _, _ = _TJ.decode_header(jpeg_bytes)
+    denominator = 1
+    while (denominator < 8 and
+           width // (denominator * 2) >= target_size.width() and
+           height // (denominator * 2) >= target_size.height()):
+        denominator *= 2
+    return (1, denominator)
+
+def scale_pixmap(pixmap, target_size):
+    """Scale for display; large sources get a fast pre-shrink before the smooth pass"""
+    if (pixmap.width() > 2 * target_size.width() and
+            pixmap.height() > 2 * target_size.height()):
+        pixmap = pixmap.scaled(2 * target_size.width(), 2 * target_size.height(),
+                               Qt.KeepAspectRatio, Qt.FastTransformation)
+    return pixmap.scaled(target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+def load_preview_pixmap(file_path, target_size=None):
+    """Load a pixmap for preview, using libjpeg-turbo SIMD decode for JPEGs"""
+    if TURBOJPEG_AVAILABLE and file_path.lower().endswith(('.jpg', '.jpeg')):
+        try:
+            with open(file_path, 'rb') as f:
+                jpeg_bytes = f.read()
+            scaling = jpeg_scaling_factor(jpeg_bytes, target_size) if target_size else (1, 1)
+            bgr = _TJ.decode(jpeg_bytes, pixel_format=TJPF_BGRX,
+                             scaling_factor=scaling,
+                             flags=TJFLAG_FASTDCT | TJFLAG_FASTUPSAMPLE)
+            height, width = bgr.shape[:2]
+            qimage = QImage(bgr.data, width, height, width * 4, QImage.Format_RGB32)
+            return QPixmap.fromImage(qimage.copy())
+        except Exception:
+            pass
+    # QImageReader decodes straight to the scaled size (DCT-domain for JPEG),
+    # instead of decoding full resolution and throwing most pixels away
+    fmt = QT_FORMATS.get(os.path.splitext(file_path)[1].lower())
+    reader = QImageReader(file_path, fmt.lower().encode()) if fmt else QImageReader(file_path)
+    if target_size is not None:
+        size = reader.size()
+        if size.isValid() and (size.width() > target_size.width() or
+                               size.height() > target_size.height()):
+            size.scale(target_size, Qt.KeepAspectRatio)
+            reader.setScaledSize(size)
+    return QPixmap.fromImage(reader.read())
+
+# Theme stylesheets are built once at module load; rebuilding ~2 KB of CSS
+# per toggle just makes Qt re-parse identical rules.
+LIGHT_QSS = """
+        QMainWindow { background-color: #f8fafc; color: #1e293b; }
+        #titleLabel { font-size: 14px; font-weight: bold; color: #6366f1; }
+        #sectionTitle { font-size: 11px; font-weight: 600; color: #374151; }
+        #compactFrame { background-color: white; border: 1px solid #e5e7eb; border-radius: 4px; }
+        #compactInput, #compactTextEdit { 
+            background-color: #f9fafb; border: 1px solid #e5e7eb; border-radius: 3px; 
+            padding: 4px; font-size: 11px; color: #1f2937;
+        }
+        #compactInput:focus, #compactTextEdit:focus { border-color: #6366f1; background-color: white; }
+        #compactCombo { 
+            background-color: #f9fafb; border: 1px solid #e5e7eb; border-radius: 3px; 
+            padding: 4px; font-size: 11px; color: #1f2937; min-height: 20px;
+        }
+        #compactCombo:focus { border-color: #6366f1; background-color: white; }
+        #compactCombo::drop-down { border: none; }
+        #compactCombo::down-arrow { image: url(none); }
+        #primaryButton { 
+            background-color: #6366f1; color: white; border: none; border-radius: 3px; 
+            padding: 4px 8px; font-size: 11px; font-weight: 600;
+        }
+        #primaryButton:hover { background-color: #5b21b6; }
+        #primaryButton:disabled { background-color: #9ca3af; }
+        #secondaryButton, #smallButton { 
+            background-color: #f3f4f6; color: #374151; border: 1px solid #e5e7eb; 
+            border-radius: 3px; padding: 4px 8px; font-size: 11px; font-weight: 600;
+        }
+        #secondaryButton:hover, #smallButton:hover { background-color: #e5e7eb; }
+        #secondaryButton:disabled, #smallButton:disabled { background-color: #f9fafb; color: #9ca3af; }
+        #themeButton { 
+            background-color: #f3f4f6; border: 1px solid #e5e7eb; border-radius: 15px;
+        }
+        #themeButton:hover { background-color: #e5e7eb; }
+        #dropArea { 
+            background-color: #f9fafb; border: 2px dashed #d1d5db; border-radius: 4px; 
+            color: #6b7280; font-size: 11px;
+        }
+        #imageDisplay { 
+            background-color: #f9fafb; border: 1px solid #d1d5db; border-radius: 4px; 
+            color: #6b7280; font-size: 12px;
+        }
+        #modernProgress { 
+            background-color: #e5e7eb; border: none; border-radius: 2px;
+        }
+        #modernProgress::chunk { 
+            background-color: #6366f1; border-radius: 2px;
+        }
+        #compactStatusBar { background-color: #f8fafc; color: #6b7280; font-size: 10px; }
+    """
+
+DARK_QSS = """
+        QMainWindow { background-color: #0f172a; color: #e2e8f0; }
+        #titleLabel { font-size: 14px; font-weight: bold; color: #8b5cf6; }
+        #sectionTitle { font-size: 11px; font-weight: 600; color: #cbd5e1; }
+        #compactFrame { background-color: #1e293b; border: 1px solid #334155; border-radius: 4px; }
+        #compactInput, #compactTextEdit { 
+            background-color: #334155; border: 1px solid #475569; border-radius: 3px; 
+            padding: 4px; font-size: 11px; color: #f1f5f9;
+        }
+        #compactInput:focus, #compactTextEdit:focus { border-color: #8b5cf6; background-color: #475569; }
+        #compactCombo { 
+            background-color: #334155; border: 1px solid #475569; border-radius: 3px; 
+            padding: 4px; font-size: 11px; color: #f1f5f9; min-height: 20px;
+        }
+        #compactCombo:focus { border-color: #8b5cf6; background-color: #475569; }
+        #compactCombo::drop-down { border: none; }
+        #compactCombo::down-arrow { image: url(none); }
+        #primaryButton { 
+            background-color: #8b5cf6; color: white; border: none; border-radius: 3px; 
+            padding: 4px 8px; font-size: 11px; font-weight: 600;
+        }
+        #primaryButton:hover { background-color: #7c3aed; }
+        #primaryButton:disabled { background-color: #64748b; }
+        #secondaryButton, #smallButton { 
+            background-color: #475569; color: #e2e8f0; border: 1px solid #64748b; 
+            border-radius: 3px; padding: 4px 8px; font-size: 11px; font-weight: 600;
+        }
+        #secondaryButton:hover, #smallButton:hover { background-color: #64748b; }
+        #secondaryButton:disabled, #smallButton:disabled { background-color: #334155; color: #64748b; }
+        #themeButton { 
+            background-color: #475569; border: 1px solid #64748b; border-radius: 15px;
+        }
+        #themeButton:hover { background-color: #64748b; }
+        #dropArea { 
+            background-color: #334155; border: 2px dashed #64748b; border-radius: 4px; 
+            color: #94a3b8; font-size: 11px;
+        }
+        #imageDisplay { 
+            background-color: #334155; border: 1px solid #64748b; border-radius: 4px; 
+            color: #94a3b8; font-size: 12px;
+        }
+        #modernProgress { 
+            background-color: #475569; border: none; border-radius: 2px;
+        }
+        #modernProgress::chunk { 
+            background-color: #8b5cf6; border-radius: 2px;
+        }
+        #compactStatusBar { background-color: #0f172a; color: #94a3b8; font-size: 10px; }
+    """
 
 class DropLabel(QLabel):
     """Label that accepts drag and drop for image files"""
     file_dropped = Signal(str)
-    
+    files_dropped = Signal(list)
+
     def __init__(self, text="", parent=None):
         super().__init__(text, parent)
         self.setAcceptDrops(True)
         self.setAlignment(Qt.AlignCenter)
     
     def dragEnterEvent(self, event: QDragEnterEvent):
+        # Called for every mouse move during a drag, so keep allocations down:
+        # only the extension is sliced and lowercased, never the whole path.
         if event.mimeData().hasUrls():
             urls = event.mimeData().urls()
-            if urls and urls[0].toLocalFile().lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                event.acceptProposedAction()
-            else:
-                event.ignore()
-        else:
-            event.ignore()
+            if urls:
+                path = urls[0].toLocalFile()
+                dot = path.rfind('.')
+                if dot >= 0 and path[dot:].lower() in IMAGE_EXTENSIONS:
+                    event.acceptProposedAction()
+                    return
+        event.ignore()
     
     def dropEvent(self, event: QDropEvent):
-        urls = event.mimeData().urls()
-        if urls:
-            file_path = urls[0].toLocalFile()
-            self.file_dropped.emit(file_path)
+        paths = []
+        for url in event.mimeData().urls():
+            path = url.toLocalFile()
+            dot = path.rfind('.')
+            if dot >= 0 and path[dot:].lower() in IMAGE_EXTENSIONS:
+                paths.append(path)
+        if paths:
+            self.file_dropped.emit(paths[0])
+            if len(paths) > 1:
+                self.files_dropped.emit(paths[1:])
             event.acceptProposedAction()
 
-class ImageWorker(QThread):
-    """Worker thread for both image generation and recognition"""
+class GeminiAsyncRuntime:
+    """Single background thread hosting an asyncio loop for all API calls
+
+    Many generate/recognize calls share one OS thread and overlap on the
+    network instead of each parking a pool thread for the duration of a
+    5-30 s request.
+    """
+
+    __slots__ = ('loop', 'thread')
+
+    _instance = None
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever,
+                                       name='gemini-async', daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = GeminiAsyncRuntime()
+        return cls._instance
+
+    def submit(self, coro):
+        """Schedule a coroutine on the shared loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+class WorkerSignals(QObject):
+    """Signal holder for pooled image jobs"""
     image_generated = Signal(object)
     image_recognized = Signal(str)
+    recognition_chunk = Signal(str)
     error_occurred = Signal(str)
     progress_updated = Signal(int)
-    
+    file_saved = Signal(str)
+
+class SaveWorker(QRunnable):
+    """Pooled job that encodes and writes an image to disk"""
+
+    def __init__(self, image, path):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self.image = image
+        self.path = path
+
+    def run(self):
+        try:
+            # PIL issues many small writes per scanline chunk; a 1 MiB buffer
+            # coalesces them into a handful of syscalls
+            fmt = QT_FORMATS.get(os.path.splitext(self.path)[1].lower(), 'PNG')
+            with open(self.path, 'wb', buffering=1 << 20) as f:
+                self.image.save(f, format=fmt)
+            self.signals.file_saved.emit(self.path)
+        except Exception as e:
+            self.signals.error_occurred.emit(f"Save failed: {str(e)}")
+
+class ConfigWriteWorker(QRunnable):
+    """Pooled job that writes the serialized config bytes atomically"""
+
+    def __init__(self, path, payload, fsync=False):
+        super().__init__()
+        self.path = path
+        self.payload = payload
+        self.fsync = fsync
+
+    def run(self):
+        try:
+            # A unique temp name per writer keeps concurrent instances from
+            # truncating each other mid-write; os.replace then makes the
+            # publish atomic last-wins
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(self.payload)
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            pass
+
+class ImageWorker(QRunnable):
+    """Pooled worker for both image generation and recognition"""
+
     def __init__(self, api_key, operation, data, model=None, recognition_prompt=None):
         super().__init__()
+        self.signals = WorkerSignals()
+        self.image_generated = self.signals.image_generated
+        self.image_recognized = self.signals.image_recognized
+        self.recognition_chunk = self.signals.recognition_chunk
+        self.error_occurred = self.signals.error_occurred
+        self.progress_updated = self.signals.progress_updated
         self.api_key = api_key
         self.operation = operation
         self.data = data
         self.model = model
         self.recognition_prompt = recognition_prompt
-    
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the in-flight job to stop at the next stream chunk"""
+        self._cancelled = True
+
+    def start(self):
+        """Run API jobs on the shared asyncio loop; mock jobs on the pool"""
+        if GEMINI_AVAILABLE:
+            GeminiAsyncRuntime.instance().submit(self.run_async())
+        else:
+            QThreadPool.globalInstance().start(self)
+
     def run(self):
+        """Pool entry point, only reached in mock mode"""
         try:
             self.progress_updated.emit(10)
-            
-            if not GEMINI_AVAILABLE:
-                if self.operation == 'generate':
-                    self.generate_mock_image()
-                else:
-                    self.error_occurred.emit("Image recognition requires Gemini API")
-                return
-            
+            load_heavy_imports()
+
+            if self.operation == 'generate':
+                self.generate_mock_image()
+            else:
+                self.error_occurred.emit("Image recognition requires Gemini API")
+
+        except Exception as e:
+            self.error_occurred.emit(f"API Error: {str(e)}")
+
+    async def run_async(self):
+        try:
+            self.progress_updated.emit(10)
+            load_heavy_imports()
+
             self.progress_updated.emit(30)
-            client = genai.Client(api_key=self.api_key)
-            
+            client = self.get_client(self.api_key)
+
             if self.operation == 'generate':
-                self.generate_image(client)
+                await self.generate_image(client)
             elif self.operation == 'recognize':
-                self.recognize_image(client)
-                
+                await self.recognize_image(client)
+
         except Exception as e:
             self.error_occurred.emit(f"API Error: {str(e)}")
-    
-    def generate_image(self, client):
+
+    async def generate_image(self, client):
         """Generate image from prompt"""
         self.progress_updated.emit(50)
-        
-        response = client.models.generate_content(
+
+        stream = await client.aio.models.generate_content_stream(
             model=self.model or "gemini-2.0-flash-preview-image-generation",
             contents=self.data,
             config=types.GenerateContentConfig(
                 response_modalities=['TEXT', 'IMAGE']
             )
         )
-        
-        self.progress_updated.emit(80)
-        
-        for part in response.candidates[0].content.parts:
-            if part.inline_data is not None:
-                image = Image.open(BytesIO(part.inline_data.data))
-                self.progress_updated.emit(100)
-                self.image_generated.emit(image)
+
+        # Real progress from stream events instead of the old scripted jumps
+        progress = 55
+        async for chunk in stream:
+            if self._cancelled:
+                self.error_occurred.emit("Cancelled")
                 return
-        
+            for candidate in chunk.candidates or []:
+                parts = candidate.content.parts if candidate.content else None
+                for part in parts or []:
+                    if part.inline_data is not None:
+                        image = Image.open(BytesIO(part.inline_data.data))
+                        self.progress_updated.emit(100)
+                        self.image_generated.emit(image)
+                        return
+            progress = min(progress + 5, 95)
+            self.progress_updated.emit(progress)
+
         self.error_occurred.emit("No image found in API response")
     
-    def recognize_image(self, client):
+    async def recognize_image(self, client):
         """Recognize and describe image"""
         self.progress_updated.emit(50)
-        
+
+        prompt = self.recognition_prompt or "Describe this image in detail for AI image generation purposes."
+
+        # Hash straight over the mapped pages for the cache key; the heap copy
+        # is only made once we know the result isn't cached.
+        image_bytes = None
         with open(self.data, 'rb') as f:
-            image_bytes = f.read()
-        
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=[
-                types.Part.from_bytes(
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    cache_path = self.recognition_cache_path(mm, RECOGNITION_MODEL, prompt)
+                    if not cache_path.exists():
+                        image_bytes = bytes(mm)
+            except (ValueError, OSError):
+                image_bytes = f.read()
+                cache_path = self.recognition_cache_path(image_bytes, RECOGNITION_MODEL, prompt)
+
+        if cache_path.exists():
+            self.progress_updated.emit(100)
+            self.image_recognized.emit(cache_path.read_text(encoding='utf-8'))
+            return
+
+        small_jpeg = self.downscale_for_upload(image_bytes)
+        if small_jpeg is not None:
+            image_part = types.Part.from_bytes(data=small_jpeg, mime_type='image/jpeg')
+        else:
+            try:
+                image_part = await self.get_uploaded_file(client, self.data, image_bytes)
+            except Exception:
+                image_part = types.Part.from_bytes(
                     data=image_bytes,
-                    mime_type='image/jpeg' if self.data.lower().endswith('.jpg') or self.data.lower().endswith('.jpeg') else 'image/png',
-                ),
-                self.recognition_prompt or "Describe this image in detail for AI image generation purposes."
-            ]
+                    mime_type=MIME_TYPES.get(os.path.splitext(self.data)[1].lower(), 'application/octet-stream'),
+                )
+
+        contents = [image_part, prompt]
+        config = None
+        cache_name = await self.get_context_cache(client, prompt)
+        if cache_name:
+            contents = [image_part]
+            config = types.GenerateContentConfig(cached_content=cache_name)
+
+        stream = await client.aio.models.generate_content_stream(
+            model=RECOGNITION_MODEL,
+            contents=contents,
+            config=config
         )
-        
+
+        pieces = []
+        progress = 60
+        async for chunk in stream:
+            if self._cancelled:
+                self.error_occurred.emit("Cancelled")
+                return
+            if chunk.text:
+                pieces.append(chunk.text)
+                self.recognition_chunk.emit(chunk.text)
+                progress = min(progress + 5, 95)
+                self.progress_updated.emit(progress)
+
+        text = ''.join(pieces)
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(text, encoding='utf-8')
+        except OSError:
+            pass
+
         self.progress_updated.emit(100)
-        self.image_recognized.emit(response.text)
+        self.image_recognized.emit(text)
+
+    _clients = {}
+    _uploaded_files = {}
+    _context_cache_name = None
+    _context_cache_prompt = None
+    _context_cache_expiry = 0
+
+    @classmethod
+    async def get_uploaded_file(cls, client, path, image_bytes):
+        """Upload a file once via the Files API and reuse the remote handle
+
+        Keyed by content hash so renamed/moved copies of the same image
+        still hit; entries are renewed an hour before the Files API's
+        48-hour expiry.
+        """
+        key = hashlib.sha256(image_bytes).hexdigest()
+        entry = cls._uploaded_files.get(key)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        uploaded = await client.aio.files.upload(file=path)
+        cls._uploaded_files[key] = (uploaded, time.time() + 47 * 3600)
+        return uploaded
+
+    @classmethod
+    def get_client(cls, api_key):
+        """Reuse one genai.Client (and its connection pool) per API key"""
+        client = cls._clients.get(api_key)
+        if client is None:
+            client = genai.Client(api_key=api_key,
+                                  http_options=types.HttpOptions(timeout=60000))
+            cls._clients[api_key] = client
+        return client
+
+    @classmethod
+    async def get_context_cache(cls, client, prompt):
+        """Create (once) a server-side context cache for the recognition prompt
+
+        Recreated whenever the prompt changes or the 3600s server TTL is
+        about to lapse, so a stale cache name is never sent.
+        """
+        if cls._context_cache_prompt != prompt or time.time() >= cls._context_cache_expiry:
+            try:
+                cache = await client.aio.caches.create(
+                    model=RECOGNITION_MODEL,
+                    config=types.CreateCachedContentConfig(contents=[prompt], ttl='3600s')
+                )
+                cls._context_cache_name = cache.name
+            except Exception:
+                cls._context_cache_name = None
+            cls._context_cache_prompt = prompt
+            cls._context_cache_expiry = time.time() + 3300
+        return cls._context_cache_name
+
+    @classmethod
+    def invalidate_context_cache(cls):
+        """Drop the cached prompt so the next recognition recreates it"""
+        cls._context_cache_name = None
+        cls._context_cache_prompt = None
+        cls._context_cache_expiry = 0
+
+    @staticmethod
+    def downscale_for_upload(image_bytes):
+        """Re-encode oversized images at max-edge 1024 before upload
+
+        The vision model tiles high-resolution inputs anyway, so sending a
+        12 MP original only costs upload time and tokens. Returns None when
+        the image is already small enough or cannot be resized.
+        """
+        if not PIL_AVAILABLE:
+            return None
+        try:
+            im = Image.open(BytesIO(image_bytes))
+            if max(im.size) <= 1024:
+                return None
+            im.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+            buf = BytesIO()
+            im.convert('RGB').save(buf, format='JPEG', quality=90)
+            return buf.getvalue()
+        except Exception:
+            return None
+
+    @staticmethod
+    def recognition_cache_path(image_bytes, model, prompt):
+        """Cache file for a recognition result, keyed by image, model and prompt"""
+        key = hashlib.blake2b(image_bytes, digest_size=16)
+        key.update(model.encode('utf-8'))
+        key.update(prompt.encode('utf-8'))
+        return RECOG_CACHE_DIR / f"{key.hexdigest()}.txt"
     
+    _mock_font = None
+    _mock_canvas = None
+
     def generate_mock_image(self):
         """Generate a placeholder image for testing"""
         try:
-            from PIL import Image, ImageDraw, ImageFont
-            
+            cls = ImageWorker
+
             self.progress_updated.emit(50)
-            
-            img = Image.new('RGB', (400, 400), color='lightblue')
+
+            if cls._mock_canvas is None:
+                cls._mock_canvas = Image.new('RGB', (400, 400), color='lightblue')
+            if cls._mock_font is None:
+                try:
+                    cls._mock_font = ImageFont.truetype("arial.ttf", 16)
+                except:
+                    cls._mock_font = ImageFont.load_default()
+
+            img = cls._mock_canvas.copy()
             draw = ImageDraw.Draw(img)
-            
+            font = cls._mock_font
+
             text = "Mock Image\n\n" + self.data[:80] + "..."
-            try:
-                font = ImageFont.truetype("arial.ttf", 16)
-            except:
-                font = ImageFont.load_default()
-            
+
             self.progress_updated.emit(80)
             
             lines = text.split('\n')
@@ -165,32 +682,48 @@ class GeminiImageGenerator(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_image = None
+        self._display_buffer = None
+        self._full_pixmap = None
+        self._last_label_size = None
+        self._scaled_key = None
+        self._scaled_pixmap = None
         self.last_prompt = ""
         self.config_file = "config.json"
         self.dark_theme = True
+        self._last_theme = None
         self.recognition_prompt = "Describe this image in detail for AI image generation purposes. Focus on visual elements, style, composition, colors, and mood."
         self.temp_dir = tempfile.mkdtemp(prefix="gemini_gen_")
-        
-        # Define available models
-        self.models = {
-            "Gemini 2.0 Flash": "gemini-2.0-flash",
-            "Gemini 2.0 Flash (Image Gen)": "gemini-2.0-flash-preview-image-generation",
-            "Gemini 2.0 Flash-Lite": "gemini-2.0-flash-lite",
-            "Gemini 1.5 Flash": "gemini-1.5-flash",
-            "Gemini 1.5 Flash-8B": "gemini-1.5-flash-8b",
-            "Gemini 1.5 Pro": "gemini-1.5-pro",
-            "Imagen 4": "imagen-4.0-generate-preview-06-06",
-            "Imagen 4 Ultra": "imagen-4.0-ultra-generate-preview-06-06"
-        }
-        
+        self._gen_counter = itertools.count()
+
+        # Recycled worker threads; cap at 2 so rapid drops don't flood the API
+        QThreadPool.globalInstance().setMaxThreadCount(2)
+        self._active_workers = set()
+
+        # Session-local recognition results keyed by cheap content hash,
+        # so re-dropping the same file skips the worker entirely
+        self._recog_cache = {}
+        # Length of the primary recognition's region at the top of
+        # context_output; batch-drop results live below it
+        self._primary_len = 0
+
+        self._last_config_bytes = None
+        self._config_cache = None
+        self._config_stat = None
+        self._error_box = None
+        # Durability knob: config saves skip fsync by default; flipping this
+        # forces each write to the platter before the atomic replace
+        self.fsync_on_save = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(250)
+        self._save_timer.timeout.connect(self._do_save_config)
+
         self.init_ui()
-        self.load_config()
         self.apply_theme()
-        
-        self.status_timer = QTimer()
-        self.status_timer.setSingleShot(True)
-        self.status_timer.timeout.connect(self.clear_status)
-    
+        # Defer the config read until the event loop is up, so the first
+        # paint doesn't wait on disk I/O or JSON parsing
+        QTimer.singleShot(0, self.load_config)
+
     def setup_windows_taskbar(self):
         """Setup Windows taskbar icon and app ID"""
         try:
@@ -200,8 +733,38 @@ class GeminiImageGenerator(QMainWindow):
         except:
             pass
     
+    def resizeEvent(self, event):
+        """Rescale the cached result pixmap only on real geometry changes"""
+        super().resizeEvent(event)
+        if self._full_pixmap is None:
+            return
+        size = self.image_label.size()
+        if size == self._last_label_size:
+            return
+        self._last_label_size = size
+        self.image_label.setPixmap(self._full_pixmap.scaled(
+            size, Qt.KeepAspectRatio, Qt.FastTransformation))
+        QTimer.singleShot(80, self.smooth_rescale)
+
+    def smooth_rescale(self):
+        """High-quality rescale once resizing has settled"""
+        if self._full_pixmap is not None:
+            self.image_label.setPixmap(self.scaled_for_label(self._full_pixmap))
+
+    def scaled_for_label(self, pixmap):
+        """Scale for the result label, memoized on source pixmap and label size"""
+        key = (pixmap.cacheKey(), self.image_label.width(), self.image_label.height())
+        if key != self._scaled_key:
+            self._scaled_key = key
+            self._scaled_pixmap = scale_pixmap(pixmap, self.image_label.size())
+        return self._scaled_pixmap
+
     def closeEvent(self, event):
-        """Clean up temp folder on close"""
+        """Flush any pending config save and clean up temp folder on close"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._do_save_config()
+        QThreadPool.globalInstance().waitForDone(2000)
         try:
             if os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
@@ -213,7 +776,7 @@ class GeminiImageGenerator(QMainWindow):
         """Initialize the enhanced compact user interface"""
         self.setWindowTitle("Gemini Image Generator")
         self.setFixedSize(500, 800)
-        self.setWindowIcon(qta.icon('fa5s.magic', color='#6366f1'))
+        self.setWindowIcon(cached_icon('fa5s.magic', color='#6366f1'))
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -233,7 +796,7 @@ class GeminiImageGenerator(QMainWindow):
         self.reset_btn = QPushButton()
         self.reset_btn.setObjectName("smallButton")
         self.reset_btn.setFixedSize(30, 30)
-        self.reset_btn.setIcon(qta.icon('fa5s.trash'))
+        self.reset_btn.setIcon(cached_icon('fa5s.trash'))
         self.reset_btn.clicked.connect(self.reset_all)
         self.reset_btn.setToolTip("Reset all content")
         header_layout.addWidget(self.reset_btn)
@@ -269,8 +832,8 @@ class GeminiImageGenerator(QMainWindow):
         
         self.model_combo = QComboBox()
         self.model_combo.setObjectName("compactCombo")
-        for display_name in self.models.keys():
-            self.model_combo.addItem(display_name)
+        for display_name, model_id in MODELS.items():
+            self.model_combo.addItem(display_name, model_id)
         self.model_combo.setCurrentText("Gemini 2.0 Flash (Image Gen)")
         self.model_combo.currentTextChanged.connect(self.save_config)
         model_layout.addWidget(self.model_combo)
@@ -300,6 +863,11 @@ class GeminiImageGenerator(QMainWindow):
         self.prompt_btn.setFixedSize(40, 20)
         self.prompt_btn.clicked.connect(self.edit_recognition_prompt)
         context_header.addWidget(self.prompt_btn)
+
+        self.auto_generate_check = QCheckBox("Auto")
+        self.auto_generate_check.setToolTip("Generate immediately from the image description")
+        self.auto_generate_check.toggled.connect(self.save_config)
+        context_header.addWidget(self.auto_generate_check)
         
         context_layout.addLayout(context_header)
         
@@ -307,6 +875,7 @@ class GeminiImageGenerator(QMainWindow):
         self.drop_area.setObjectName("dropArea")
         self.drop_area.setFixedHeight(60)
         self.drop_area.file_dropped.connect(self.handle_dropped_file)
+        self.drop_area.files_dropped.connect(self.handle_dropped_files)
         context_layout.addWidget(self.drop_area)
         
         self.context_output = QTextEdit()
@@ -339,26 +908,34 @@ class GeminiImageGenerator(QMainWindow):
         self.use_context_btn = QPushButton("Use Context")
         self.use_context_btn.setObjectName("smallButton")
         self.use_context_btn.setFixedHeight(25)
-        self.use_context_btn.setIcon(qta.icon('fa5s.copy'))
+        self.use_context_btn.setIcon(cached_icon('fa5s.copy'))
         self.use_context_btn.clicked.connect(self.use_context)
         self.use_context_btn.setEnabled(False)
         
         self.generate_btn = QPushButton("Generate")
         self.generate_btn.setObjectName("primaryButton")
         self.generate_btn.setFixedHeight(25)
-        self.generate_btn.setIcon(qta.icon('fa5s.magic'))
+        self.generate_btn.setIcon(cached_icon('fa5s.magic'))
         self.generate_btn.clicked.connect(self.generate_image)
         
         self.regenerate_btn = QPushButton("Regen")
         self.regenerate_btn.setObjectName("secondaryButton")
         self.regenerate_btn.setFixedHeight(25)
-        self.regenerate_btn.setIcon(qta.icon('fa5s.redo'))
+        self.regenerate_btn.setIcon(cached_icon('fa5s.redo'))
         self.regenerate_btn.clicked.connect(self.regenerate_image)
         self.regenerate_btn.setEnabled(False)
-        
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setObjectName("secondaryButton")
+        self.cancel_btn.setFixedHeight(25)
+        self.cancel_btn.setIcon(cached_icon('fa5s.times'))
+        self.cancel_btn.clicked.connect(self.cancel_current)
+        self.cancel_btn.setEnabled(False)
+
         button_layout.addWidget(self.use_context_btn)
         button_layout.addWidget(self.generate_btn)
         button_layout.addWidget(self.regenerate_btn)
+        button_layout.addWidget(self.cancel_btn)
         
         prompt_layout.addLayout(button_layout)
         main_layout.addWidget(prompt_frame)
@@ -384,7 +961,7 @@ class GeminiImageGenerator(QMainWindow):
         self.save_btn = QPushButton("Save")
         self.save_btn.setObjectName("smallButton")
         self.save_btn.setFixedSize(40, 20)
-        self.save_btn.setIcon(qta.icon('fa5s.save'))
+        self.save_btn.setIcon(cached_icon('fa5s.save'))
         self.save_btn.clicked.connect(self.save_image)
         self.save_btn.setEnabled(False)
         image_header.addWidget(self.save_btn)
@@ -395,6 +972,7 @@ class GeminiImageGenerator(QMainWindow):
         self.image_label.setObjectName("imageDisplay")
         self.image_label.setFixedSize(488, 300)
         self.image_label.file_dropped.connect(self.handle_dropped_file)
+        self.image_label.files_dropped.connect(self.handle_dropped_files)
         
         image_layout.addWidget(self.image_label)
         main_layout.addWidget(image_frame)
@@ -406,118 +984,18 @@ class GeminiImageGenerator(QMainWindow):
         if not GEMINI_AVAILABLE:
             self.status_bar.showMessage("⚠️ Mock mode", 3000)
     
-    def get_light_theme_style(self):
-        """Enhanced light theme with progress bar and combo styling"""
-        return """
-            QMainWindow { background-color: #f8fafc; color: #1e293b; }
-            #titleLabel { font-size: 14px; font-weight: bold; color: #6366f1; }
-            #sectionTitle { font-size: 11px; font-weight: 600; color: #374151; }
-            #compactFrame { background-color: white; border: 1px solid #e5e7eb; border-radius: 4px; }
-            #compactInput, #compactTextEdit { 
-                background-color: #f9fafb; border: 1px solid #e5e7eb; border-radius: 3px; 
-                padding: 4px; font-size: 11px; color: #1f2937;
-            }
-            #compactInput:focus, #compactTextEdit:focus { border-color: #6366f1; background-color: white; }
-            #compactCombo { 
-                background-color: #f9fafb; border: 1px solid #e5e7eb; border-radius: 3px; 
-                padding: 4px; font-size: 11px; color: #1f2937; min-height: 20px;
-            }
-            #compactCombo:focus { border-color: #6366f1; background-color: white; }
-            #compactCombo::drop-down { border: none; }
-            #compactCombo::down-arrow { image: url(none); }
-            #primaryButton { 
-                background-color: #6366f1; color: white; border: none; border-radius: 3px; 
-                padding: 4px 8px; font-size: 11px; font-weight: 600;
-            }
-            #primaryButton:hover { background-color: #5b21b6; }
-            #primaryButton:disabled { background-color: #9ca3af; }
-            #secondaryButton, #smallButton { 
-                background-color: #f3f4f6; color: #374151; border: 1px solid #e5e7eb; 
-                border-radius: 3px; padding: 4px 8px; font-size: 11px; font-weight: 600;
-            }
-            #secondaryButton:hover, #smallButton:hover { background-color: #e5e7eb; }
-            #secondaryButton:disabled, #smallButton:disabled { background-color: #f9fafb; color: #9ca3af; }
-            #themeButton { 
-                background-color: #f3f4f6; border: 1px solid #e5e7eb; border-radius: 15px;
-            }
-            #themeButton:hover { background-color: #e5e7eb; }
-            #dropArea { 
-                background-color: #f9fafb; border: 2px dashed #d1d5db; border-radius: 4px; 
-                color: #6b7280; font-size: 11px;
-            }
-            #imageDisplay { 
-                background-color: #f9fafb; border: 1px solid #d1d5db; border-radius: 4px; 
-                color: #6b7280; font-size: 12px;
-            }
-            #modernProgress { 
-                background-color: #e5e7eb; border: none; border-radius: 2px;
-            }
-            #modernProgress::chunk { 
-                background-color: #6366f1; border-radius: 2px;
-            }
-            #compactStatusBar { background-color: #f8fafc; color: #6b7280; font-size: 10px; }
-        """
-    
-    def get_dark_theme_style(self):
-        """Enhanced dark theme with progress bar and combo styling"""
-        return """
-            QMainWindow { background-color: #0f172a; color: #e2e8f0; }
-            #titleLabel { font-size: 14px; font-weight: bold; color: #8b5cf6; }
-            #sectionTitle { font-size: 11px; font-weight: 600; color: #cbd5e1; }
-            #compactFrame { background-color: #1e293b; border: 1px solid #334155; border-radius: 4px; }
-            #compactInput, #compactTextEdit { 
-                background-color: #334155; border: 1px solid #475569; border-radius: 3px; 
-                padding: 4px; font-size: 11px; color: #f1f5f9;
-            }
-            #compactInput:focus, #compactTextEdit:focus { border-color: #8b5cf6; background-color: #475569; }
-            #compactCombo { 
-                background-color: #334155; border: 1px solid #475569; border-radius: 3px; 
-                padding: 4px; font-size: 11px; color: #f1f5f9; min-height: 20px;
-            }
-            #compactCombo:focus { border-color: #8b5cf6; background-color: #475569; }
-            #compactCombo::drop-down { border: none; }
-            #compactCombo::down-arrow { image: url(none); }
-            #primaryButton { 
-                background-color: #8b5cf6; color: white; border: none; border-radius: 3px; 
-                padding: 4px 8px; font-size: 11px; font-weight: 600;
-            }
-            #primaryButton:hover { background-color: #7c3aed; }
-            #primaryButton:disabled { background-color: #64748b; }
-            #secondaryButton, #smallButton { 
-                background-color: #475569; color: #e2e8f0; border: 1px solid #64748b; 
-                border-radius: 3px; padding: 4px 8px; font-size: 11px; font-weight: 600;
-            }
-            #secondaryButton:hover, #smallButton:hover { background-color: #64748b; }
-            #secondaryButton:disabled, #smallButton:disabled { background-color: #334155; color: #64748b; }
-            #themeButton { 
-                background-color: #475569; border: 1px solid #64748b; border-radius: 15px;
-            }
-            #themeButton:hover { background-color: #64748b; }
-            #dropArea { 
-                background-color: #334155; border: 2px dashed #64748b; border-radius: 4px; 
-                color: #94a3b8; font-size: 11px;
-            }
-            #imageDisplay { 
-                background-color: #334155; border: 1px solid #64748b; border-radius: 4px; 
-                color: #94a3b8; font-size: 12px;
-            }
-            #modernProgress { 
-                background-color: #475569; border: none; border-radius: 2px;
-            }
-            #modernProgress::chunk { 
-                background-color: #8b5cf6; border-radius: 2px;
-            }
-            #compactStatusBar { background-color: #0f172a; color: #94a3b8; font-size: 10px; }
-        """
     
     def apply_theme(self):
         """Apply current theme with appropriate icons"""
+        if self._last_theme == self.dark_theme:
+            return
+        self._last_theme = self.dark_theme
         if self.dark_theme:
-            self.setStyleSheet(self.get_dark_theme_style())
-            self.theme_btn.setIcon(qta.icon('fa5s.sun', color='#cbd5e1'))
+            self.setStyleSheet(DARK_QSS)
+            self.theme_btn.setIcon(cached_icon('fa5s.sun', color='#cbd5e1'))
         else:
-            self.setStyleSheet(self.get_light_theme_style())
-            self.theme_btn.setIcon(qta.icon('fa5s.moon', color='#6b7280'))
+            self.setStyleSheet(LIGHT_QSS)
+            self.theme_btn.setIcon(cached_icon('fa5s.moon', color='#6b7280'))
     
     def toggle_theme(self):
         """Toggle between themes"""
@@ -528,21 +1006,26 @@ class GeminiImageGenerator(QMainWindow):
     def reset_all(self):
         """Reset all content and clear temp folder"""
         self.context_output.clear()
+        self._primary_len = 0
         self.prompt_input.clear()
         self.drop_area.setText("📁 Drop image here")
         self.image_label.setText("✨ Generated image")
         self.image_label.setPixmap(QPixmap())
         
         self.current_image = None
+        self._full_pixmap = None
+        self._scaled_key = None
+        self._scaled_pixmap = None
         self.last_prompt = ""
-        
+
         self.use_context_btn.setEnabled(False)
         self.regenerate_btn.setEnabled(False)
         self.save_btn.setEnabled(False)
         
         try:
-            for file in os.listdir(self.temp_dir):
-                os.remove(os.path.join(self.temp_dir, file))
+            shutil.rmtree(self.temp_dir)
+            self.temp_dir = tempfile.mkdtemp(prefix="gemini_gen_")
+            self._gen_counter = itertools.count()
         except:
             pass
         
@@ -568,6 +1051,7 @@ class GeminiImageGenerator(QMainWindow):
         
         if ok and text.strip():
             self.recognition_prompt = text.strip()
+            ImageWorker.invalidate_context_cache()
             self.save_config()
             self.status_bar.showMessage("🔧 Prompt updated", 2000)
     
@@ -576,12 +1060,17 @@ class GeminiImageGenerator(QMainWindow):
         try:
             self.drop_area.setText(f"📁 {os.path.basename(file_path)}")
             
-            pixmap = QPixmap(file_path)
+            pixmap = load_preview_pixmap(file_path, self.image_label.size())
             if not pixmap.isNull():
                 if self.sender() == self.image_label:
-                    full_scaled = pixmap.scaled(self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    self.image_label.setPixmap(full_scaled)
+                    self.image_label.setPixmap(self.scaled_for_label(pixmap))
             
+            key = self.quick_file_key(file_path)
+            cached = self._recog_cache.get(key)
+            if cached is not None:
+                self.on_image_recognized(cached)
+                return
+
             self.status_bar.showMessage("🔍 Analyzing image...")
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(0)
@@ -589,42 +1078,123 @@ class GeminiImageGenerator(QMainWindow):
             self.generate_btn.setEnabled(False)
             self.regenerate_btn.setEnabled(False)
             
-            self.worker = ImageWorker(
-                self.api_key_input.text().strip(), 
-                'recognize', 
+            worker = ImageWorker(
+                self.api_key_input.text().strip(),
+                'recognize',
                 file_path,
                 recognition_prompt=self.recognition_prompt
             )
-            self.worker.image_recognized.connect(self.on_image_recognized)
-            self.worker.error_occurred.connect(self.on_error)
-            self.worker.progress_updated.connect(self.progress_bar.setValue)
-            self.worker.start()
+            # Bind the cache key to this worker's result; a shared pending
+            # slot would mis-file results when drops overlap in flight
+            worker.image_recognized.connect(
+                functools.partial(self.on_image_recognized, key=key))
+            worker.recognition_chunk.connect(self.on_recognition_chunk)
+            worker.error_occurred.connect(self.on_error)
+            worker.progress_updated.connect(self.progress_bar.setValue)
+            self.context_output.clear()
+            self._primary_len = 0
+            self.cancel_btn.setEnabled(True)
+            self.launch_worker(worker)
             
         except Exception as e:
             self.show_error(f"Failed to process image: {str(e)}")
     
-    def on_image_recognized(self, description):
+    def handle_dropped_files(self, file_paths):
+        """Analyze the extra files from a multi-file drop concurrently"""
+        for file_path in file_paths:
+            worker = ImageWorker(
+                self.api_key_input.text().strip(),
+                'recognize',
+                file_path,
+                recognition_prompt=self.recognition_prompt
+            )
+            worker.image_recognized.connect(self.on_extra_image_recognized)
+            worker.error_occurred.connect(self.on_extra_error)
+            self.launch_worker(worker)
+
+    def cancel_current(self):
+        """Cancel in-flight API jobs; they stop at their next stream chunk"""
+        for worker in list(self._active_workers):
+            if isinstance(worker, ImageWorker):
+                worker.cancel()
+
+    def on_recognition_chunk(self, chunk):
+        """Stream partial description text into the context box as it arrives
+
+        Chunks go into the primary result's own region at the top of the
+        document, so batch-drop descriptions appended below are never
+        interleaved with the stream.
+        """
+        cursor = self.context_output.textCursor()
+        cursor.setPosition(self._primary_len)
+        cursor.insertText(chunk)
+        self._primary_len += len(chunk)
+
+    def on_extra_error(self, error_message):
+        """Report a batch-file failure without touching the primary job's UI"""
+        if error_message != "Cancelled":
+            self.status_bar.showMessage(f"⚠️ {error_message}", 3000)
+
+    def on_extra_image_recognized(self, description):
+        """Append batch-drop descriptions below the first result"""
+        self.context_output.append("")
+        self.context_output.append(description)
+        self.use_context_btn.setEnabled(True)
+
+    def quick_file_key(self, file_path):
+        """Cheap session key: first 1 MB of content, file size, and the prompt
+
+        The prompt is part of the key for the same reason it is hashed into
+        the disk cache: editing it must not serve descriptions produced by
+        the old prompt.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(1 << 20))
+        digest.update(self.recognition_prompt.encode('utf-8'))
+        return (digest.hexdigest(), os.path.getsize(file_path))
+
+    def on_image_recognized(self, description, key=None):
         """Handle successful image recognition"""
-        self.context_output.setText(description)
+        if key is not None:
+            self._recog_cache[key] = description
+        # Replace only the primary region; extras already appended below
+        # must survive the primary worker finishing after them
+        cursor = self.context_output.textCursor()
+        cursor.setPosition(0)
+        cursor.setPosition(self._primary_len, QTextCursor.KeepAnchor)
+        cursor.insertText(description)
+        self._primary_len = len(description)
         self.use_context_btn.setEnabled(True)
         self.generate_btn.setEnabled(True)
         if self.last_prompt:
             self.regenerate_btn.setEnabled(True)
-        
+        self.cancel_btn.setEnabled(False)
+
         self.progress_bar.setVisible(False)
         self.status_bar.showMessage("✅ Image analyzed", 2000)
+
+        # Speculatively pipeline recognize -> generate when Auto is on,
+        # overlapping the second round-trip with the user reading the text
+        if self.auto_generate_check.isChecked():
+            self.last_prompt = description
+            self.start_generation()
     
     def use_context(self):
         """Use context description as prompt"""
         context = self.context_output.toPlainText()
         current_prompt = self.prompt_input.toPlainText()
-        
-        if current_prompt.strip():
-            combined = f"{current_prompt}\n\nBased on: {context}"
-        else:
-            combined = context
-            
-        self.prompt_input.setText(combined)
+
+        if not current_prompt.strip():
+            self.prompt_input.setText(context)
+            return
+        if current_prompt.endswith(context):
+            return
+
+        # Append only the delta so QTextEdit doesn't re-lay-out the whole document
+        cursor = self.prompt_input.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(f"\n\nBased on: {context}")
     
     def validate_inputs(self):
         """Validate inputs"""
@@ -666,43 +1236,64 @@ class GeminiImageGenerator(QMainWindow):
         
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
+        self.cancel_btn.setEnabled(True)
         self.status_bar.showMessage("🎨 Generating...")
         
-        selected_model = self.models.get(self.model_combo.currentText())
+        selected_model = self.model_combo.currentData()
         
-        self.worker = ImageWorker(
-            self.api_key_input.text().strip(), 
-            'generate', 
+        worker = ImageWorker(
+            self.api_key_input.text().strip(),
+            'generate',
             self.last_prompt,
             selected_model
         )
-        self.worker.image_generated.connect(self.on_image_generated)
-        self.worker.error_occurred.connect(self.on_error)
-        self.worker.progress_updated.connect(self.progress_bar.setValue)
-        self.worker.start()
+        worker.image_generated.connect(self.on_image_generated)
+        worker.error_occurred.connect(self.on_error)
+        worker.progress_updated.connect(self.progress_bar.setValue)
+        self.launch_worker(worker)
     
+    def launch_worker(self, worker):
+        """Submit a job, holding a reference until it reports back
+
+        The old `self.worker = ...` attribute was overwritten on rapid
+        clicks, dropping the only reference to an in-flight job.
+        """
+        self._active_workers.add(worker)
+
+        def done(*args, worker=worker):
+            self._active_workers.discard(worker)
+
+        worker.image_generated.connect(done)
+        worker.image_recognized.connect(done)
+        worker.error_occurred.connect(done)
+        worker.start()
+
     def on_image_generated(self, image):
         """Handle generated image"""
         try:
             self.current_image = image
             
-            temp_path = os.path.join(self.temp_dir, f"generated_{len(os.listdir(self.temp_dir))}.png")
-            image.save(temp_path)
-            
-            img_byte_arr = BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            img_byte_arr.seek(0)
-            
-            pixmap = QPixmap()
-            pixmap.loadFromData(img_byte_arr.getvalue())
-            
-            scaled_pixmap = pixmap.scaled(self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+            # Archive the PNG in the background; display doesn't need the encode
+            temp_path = os.path.join(self.temp_dir, f"generated_{next(self._gen_counter)}.png")
+            self._temp_save_worker = SaveWorker(image, temp_path)
+            QThreadPool.globalInstance().start(self._temp_save_worker)
+
+            rgba = image.convert('RGBA')
+            # QImage wraps the buffer without copying, so keep it alive on self
+            self._display_buffer = rgba.tobytes('raw', 'RGBA')
+            qimage = QImage(self._display_buffer, rgba.width, rgba.height,
+                            4 * rgba.width, QImage.Format_RGBA8888)
+            pixmap = QPixmap.fromImage(qimage)
+            self._full_pixmap = pixmap
+            self._last_label_size = self.image_label.size()
+
+            self.image_label.setPixmap(self.scaled_for_label(pixmap))
             
             self.generate_btn.setEnabled(True)
             self.regenerate_btn.setEnabled(True)
             self.save_btn.setEnabled(True)
-            
+            self.cancel_btn.setEnabled(False)
+
             self.progress_bar.setVisible(False)
             self.status_bar.showMessage("✅ Generated!", 2000)
             
@@ -710,15 +1301,17 @@ class GeminiImageGenerator(QMainWindow):
             self.on_error(f"Display failed: {str(e)}")
     
     def on_error(self, error_message):
-        """Handle errors"""
-        self.show_error(error_message)
-        
+        """Handle errors (and user cancellations, which get no dialog)"""
+        if error_message != "Cancelled":
+            self.show_error(error_message)
+
         self.generate_btn.setEnabled(True)
         if self.last_prompt:
             self.regenerate_btn.setEnabled(True)
-        
+        self.cancel_btn.setEnabled(False)
+
         self.progress_bar.setVisible(False)
-        self.status_bar.showMessage("❌ Failed", 2000)
+        self.status_bar.showMessage("🚫 Cancelled" if error_message == "Cancelled" else "❌ Failed", 2000)
     
     def save_image(self):
         """Save current image to user-selected location"""
@@ -726,63 +1319,154 @@ class GeminiImageGenerator(QMainWindow):
             self.show_error("No image to save")
             return
         
-        try:
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Save Image", "generated.png",
-                "PNG (*.png);;JPEG (*.jpg)"
-            )
-            
-            if file_path:
-                self.current_image.save(file_path)
-                self.status_bar.showMessage(f"💾 Saved: {os.path.basename(file_path)}", 2000)
-                
-        except Exception as e:
-            self.show_error(f"Save failed: {str(e)}")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Image", "generated.png",
+            "PNG (*.png);;JPEG (*.jpg)"
+        )
+
+        if file_path:
+            # PNG encoding takes 50-200 ms; keep it off the GUI thread
+            self._save_worker = SaveWorker(self.current_image, file_path)
+            self._save_worker.signals.file_saved.connect(self.on_image_saved)
+            self._save_worker.signals.error_occurred.connect(self.show_error)
+            QThreadPool.globalInstance().start(self._save_worker)
+
+    def on_image_saved(self, file_path):
+        """Handle background save completion"""
+        self.status_bar.showMessage(f"💾 Saved: {os.path.basename(file_path)}", 2000)
     
+    def read_config(self):
+        """Read and parse the config file, reusing the parse when unchanged
+
+        Keyed by (mtime_ns, size) so repeat loads skip json parsing when the
+        file on disk has not moved.
+        """
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == self._config_stat:
+            return self._config_cache
+        config = read_config_file(self.config_file)
+        self._config_cache = config
+        self._config_stat = stat_key
+        return config
+
     def load_config(self):
         """Load configuration"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    self.api_key_input.setText(config.get('api_key', ''))
+            config = self.read_config()
+            if config is not None:
+                # Block change signals while restoring so the widgets we are
+                # filling don't each schedule a save of the values just read
+                widgets = (self.api_key_input, self.model_combo, self.auto_generate_check)
+                for widget in widgets:
+                    widget.blockSignals(True)
+                try:
+                    self.api_key_input.setText(self.fetch_api_key() or config.get('api_key', ''))
                     self.dark_theme = config.get('dark_theme', True)
-                    self.recognition_prompt = config.get('recognition_prompt', 
+                    self.recognition_prompt = config.get('recognition_prompt',
                         'Describe this image in detail for AI image generation purposes. Focus on visual elements, style, composition, colors, and mood.')
-                    
+
                     selected_model = config.get('selected_model', 'Gemini 2.0 Flash (Image Gen)')
-                    if selected_model in self.models:
+                    if selected_model in MODELS:
                         self.model_combo.setCurrentText(selected_model)
+
+                    self.auto_generate_check.setChecked(config.get('auto_generate', False))
+                finally:
+                    for widget in widgets:
+                        widget.blockSignals(False)
+
+                self.apply_theme()
         except Exception as e:
             self.show_error(f"Config load failed: {str(e)}")
     
     def save_config(self):
+        """Schedule a config save, coalescing bursts of changes"""
+        self._save_timer.start()
+
+    def _do_save_config(self):
         """Save configuration"""
         try:
             config = {
-                'api_key': self.api_key_input.text(),
                 'dark_theme': self.dark_theme,
                 'recognition_prompt': self.recognition_prompt,
-                'selected_model': self.model_combo.currentText()
+                'selected_model': self.model_combo.currentText(),
+                'auto_generate': self.auto_generate_check.isChecked()
             }
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
+            if not self.store_api_key(self.api_key_input.text()):
+                config['api_key'] = self.api_key_input.text()
+            # Serialize to one bytes blob, then a single write: no encoder
+            # streaming through a locked text wrapper at all
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(config)
+            else:
+                payload = json.dumps(config, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            if payload == self._last_config_bytes:
+                return
+            # Widgets are read above on the UI thread; the disk write itself
+            # runs on the pool so typing never blocks on the filesystem
+            QThreadPool.globalInstance().start(
+                ConfigWriteWorker(self.config_file, payload, fsync=self.fsync_on_save))
+            self._last_config_bytes = payload
+        except (OSError, TypeError, ValueError):
             pass
     
+    def store_api_key(self, value):
+        """Store the API key in the OS keyring; returns False when unavailable"""
+        if not KEYRING_AVAILABLE:
+            return False
+        try:
+            import keyring
+            keyring.set_password(KEYRING_SERVICE, 'api_key', value)
+            return True
+        except Exception:
+            return False
+
+    def fetch_api_key(self):
+        """Read the API key back from the OS keyring"""
+        if not KEYRING_AVAILABLE:
+            return None
+        try:
+            import keyring
+            return keyring.get_password(KEYRING_SERVICE, 'api_key')
+        except Exception:
+            return None
+
     def show_error(self, message):
         """Show compact error"""
-        QMessageBox.critical(self, "Error", message)
-    
-    def clear_status(self):
-        """Clear status"""
-        self.status_bar.clearMessage()
+        # One dialog reused across errors; constructing a QMessageBox per
+        # call rebuilds the whole widget tree each time
+        if self._error_box is None:
+            self._error_box = QMessageBox(self)
+            self._error_box.setIcon(QMessageBox.Critical)
+            self._error_box.setWindowTitle("Error")
+        self._error_box.setText(message)
+        # show() instead of exec(): a second error arriving while the box is
+        # up must not re-enter the dialog's event loop, just update the text
+        self._error_box.show()
+        self._error_box.raise_()
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Gemini Image Generator")
+    parser.add_argument('--check-config', action='store_true',
+                        help='validate config.json and exit without starting the UI')
+    args = parser.parse_args()
+    if args.check_config:
+        try:
+            read_config_file('config.json')
+        except FileNotFoundError:
+            print("No config.json found")
+            sys.exit(0)
+        except (OSError, ValueError) as e:
+            print(f"Config invalid: {e}")
+            sys.exit(1)
+        print("Config OK")
+        sys.exit(0)
     app = QApplication(sys.argv)
     app.setApplicationName("Gemini Image Generator")
-    app.setApplicationDisplayName("Gemini Image Generator")
     window = GeminiImageGenerator()
     window.show()
     sys.exit(app.exec())